@@ -2,15 +2,23 @@
 
 Run this script to test and adjust gesture recognition in real-time.
 Press keys 0-5 to test specific finger counts, 'q' to quit.
+
+Use --input-width to compare detection at the tracking resolution used by the
+demo (320, default) against full-resolution frames (0).
 """
+import argparse
 import cv2
 import sys
+from src.display import FrameRateLimiter
+from src.drawing import (StaticOverlay, cached_put_text, draw_hand_skeleton, fingertip_points,
+                         landmarks_to_pixels)
 from src.hand_tracker import HandTracker
 import src.gestures as gestures
 
 # Try Picamera2 first
 try:
     from picamera2 import Picamera2
+    from libcamera import Transform
     PICAMERA2_AVAILABLE = True
 except ImportError:
     PICAMERA2_AVAILABLE = False
@@ -18,28 +26,34 @@ except ImportError:
 
 def draw_finger_count_debug(frame, landmarks, count, direction=None):
     """Draw debug info showing which fingers are detected as extended."""
-    h, w = frame.shape[:2]
+    pts = landmarks_to_pixels(landmarks, frame.shape)
+    
+    # Draw the hand skeleton in one call
+    draw_hand_skeleton(frame, pts)
     
-    # Draw all landmarks
-    for i, (x, y, z) in enumerate(landmarks):
-        cx, cy = int(x * w), int(y * h)
-        cv2.circle(frame, (cx, cy), 3, (0, 255, 0), -1)
-        
-        # Highlight fingertips
-        if i in [4, 8, 12, 16, 20]:
-            cv2.circle(frame, (cx, cy), 8, (255, 0, 255), 2)
+    # Highlight fingertips
+    for center in fingertip_points(pts):
+        cv2.circle(frame, center, 8, (255, 0, 255), 2)
     
     # Draw finger count
-    cv2.putText(frame, f"Fingers: {count}", (10, 30), 
-                cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 255), 3)
+    cached_put_text(frame, f"Fingers: {count}", (10, 30), 
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 255), 3)
     
     # Draw direction if detected
     if direction:
-        cv2.putText(frame, f"Direction: {direction.upper()}", (10, 150), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 128, 0), 2)
+        cached_put_text(frame, f"Direction: {direction.upper()}", (10, 150), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 128, 0), 2)
+
 
+def build_instructions_overlay(shape):
+    """Pre-render the fixed key help shown at the bottom of every frame."""
+    overlay = StaticOverlay(shape)
+    overlay.put_text("Press 'q' to quit, 's' to snapshot", (10, shape[0] - 10),
+                     cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+    return overlay
 
-def main():
+
+def main(input_width=320, use_opencl=False, display_fps=15.0):
     print("=" * 60)
     print("GESTURE CALIBRATION TOOL")
     print("=" * 60)
@@ -49,11 +63,14 @@ def main():
     print("- The detected count will be displayed on screen")
     print("- Press 'q' to quit")
     print("- Press 's' to save a snapshot")
-    print("\nIf detection is inaccurate, adjust angle_threshold in")
-    print("src/gestures.py count_extended_fingers() function")
+    print("\nIf detection is inaccurate, adjust EXTENDED_ANGLE in")
+    print("src/gestures.py")
     print("=" * 60)
     
-    tracker = HandTracker()
+    print(f"Tracking input width: {input_width or 'full frame'}")
+    tracker = HandTracker(input_width=input_width or None, use_opencl=use_opencl)
+    if use_opencl and not tracker.use_opencl:
+        print("[WARNING] OpenCL not available, preprocessing frames on the CPU")
     
     # Initialize camera
     picam2 = None
@@ -63,8 +80,10 @@ def main():
         try:
             print("\n[INFO] Using Picamera2...")
             picam2 = Picamera2()
+            # BGR888 matches the old RGB888 + cvtColor(RGB2BGR) byte order
             config = picam2.create_preview_configuration(
-                main={"format": "RGB888", "size": (640, 480)}
+                main={"format": "BGR888", "size": (640, 480)},
+                transform=Transform(hflip=True, vflip=True),  # camera is upside down
             )
             picam2.configure(config)
             picam2.start()
@@ -89,21 +108,23 @@ def main():
     cv2.resizeWindow(window_name, 640, 480)
     
     snapshot_count = 0
+    instructions = None
+    display_limiter = FrameRateLimiter(display_fps)
     
     try:
         while True:
             # Capture frame
             if picam2 is not None:
-                frame_raw = picam2.capture_array()
-                frame = cv2.cvtColor(frame_raw, cv2.COLOR_RGB2BGR)
+                frame = picam2.capture_array()
             else:
                 ret, frame = cap.read()
                 if not ret:
                     print("[ERROR] Failed to read frame")
                     break
             
-            # Flip frame if camera is upside down
-            frame = cv2.rotate(frame, cv2.ROTATE_180)
+            # Flip frame if camera is upside down (Picamera2 does it in the ISP)
+            if picam2 is None:
+                cv2.flip(frame, -1, dst=frame)
             
             # Process hand tracking
             hands = tracker.process_frame(frame)
@@ -116,16 +137,20 @@ def main():
                 finger_count = gestures.count_extended_fingers(landmarks, hand.get("handedness"))
                 
                 # Detect gesture with direction
-                try:
-                    gesture_info = gestures.detect_gesture_with_direction(landmarks, hand.get("handedness"))
-                    gesture = gesture_info['gesture']
-                    direction = gesture_info['direction']
-                    combined = gesture_info['combined']
-                except (AttributeError, KeyError):
-                    gesture = gestures.detect_gesture_with_handedness(landmarks, hand.get("handedness"))
-                    direction = None
-                    combined = gesture
-                
+                gesture_info = gestures.detect_gesture_with_direction(landmarks, hand.get("handedness"))
+                gesture = gesture_info['gesture']
+                direction = gesture_info['direction']
+                combined = gesture_info['combined']
+            else:
+                # Reset movement tracking once the hand has been gone for a
+                # few frames
+                gestures.note_no_hand()
+            
+            # Tracking runs every frame; drawing and display at display_fps
+            if not display_limiter.ready():
+                continue
+            
+            if hands:
                 # Draw debug info
                 draw_finger_count_debug(frame, landmarks, finger_count, direction)
                 
@@ -134,26 +159,25 @@ def main():
                     display_text = gesture
                     if direction:
                         display_text = f"{gesture} + {direction}"
-                    cv2.putText(frame, f"Gesture: {display_text}", (10, 70), 
-                                cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 0), 3)
+                    cached_put_text(frame, f"Gesture: {display_text}", (10, 70), 
+                                    cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 0), 3)
                 
                 # Display combined gesture
                 if combined and combined != gesture:
-                    cv2.putText(frame, f"Combined: {combined}", (10, 110), 
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.8, (128, 255, 128), 2)
+                    cached_put_text(frame, f"Combined: {combined}", (10, 110), 
+                                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (128, 255, 128), 2)
                 
                 # Display handedness
-                cv2.putText(frame, f"{hand.get('handedness', 'Unknown')} hand", (10, 190), 
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+                cached_put_text(frame, f"{hand.get('handedness', 'Unknown')} hand", (10, 190), 
+                                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
             else:
-                # Reset movement tracking when no hand
-                gestures.reset_movement_tracking()
-                cv2.putText(frame, "No hand detected", (10, 30), 
-                            cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 255), 2)
+                cached_put_text(frame, "No hand detected", (10, 30), 
+                                cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 255), 2)
             
-            # Display instructions
-            cv2.putText(frame, "Press 'q' to quit, 's' to snapshot", (10, frame.shape[0] - 10), 
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+            # Display instructions (rendered once, copied onto each frame)
+            if instructions is None or instructions.shape != frame.shape[:2]:
+                instructions = build_instructions_overlay(frame.shape)
+            instructions.apply(frame)
             
             # Show frame
             cv2.imshow(window_name, frame)
@@ -183,4 +207,12 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input-width", type=int, default=320,
+                        help="downscale frames to this width before hand tracking (0 = full resolution)")
+    parser.add_argument("--opencl", action="store_true",
+                        help="resize/convert frames for hand tracking on an OpenCL device")
+    parser.add_argument("--display-fps", type=float, default=15.0,
+                        help="maximum window refresh rate (0 = every frame)")
+    args = parser.parse_args()
+    main(input_width=args.input_width, use_opencl=args.opencl, display_fps=args.display_fps)
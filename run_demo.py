@@ -13,8 +13,15 @@ import argparse
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--robot", choices=["mock", "serial", "gpio"], default="mock")
+    parser.add_argument("--opencl", action="store_true",
+                        help="resize/convert frames for hand tracking on an OpenCL device")
+    parser.add_argument("--display-fps", type=float, default=15.0,
+                        help="maximum window refresh rate (0 = every frame)")
+    parser.add_argument("--display", choices=["cv2", "fb"], default="cv2",
+                        help="cv2: OpenCV window (X/VNC); fb: write to /dev/fb0 (console, no X)")
     args = parser.parse_args()
-    demo.main(robot_type=args.robot)
+    demo.main(robot_type=args.robot, use_opencl=args.opencl, display_fps=args.display_fps,
+              display_backend=args.display)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,84 @@
+"""Background frame capture so camera reads overlap hand tracking."""
+import threading
+
+
+class CaptureThread:
+    """Read frames on a worker thread and hand the newest one to the caller.
+
+    Usage:
+        capture = CaptureThread(cap.read)
+        capture.start()
+        ok, frame = capture.read()   # newest frame, waits for a new one
+        capture.stop()
+
+    `read_fn(out)` must return (ok, frame). It may fill and return `out`
+    (a previously returned array, or None on first use) the way
+    `cv2.VideoCapture.read` does, or ignore it and return a new array, e.g.
+    `lambda out: (True, picam2.capture_array())`.
+
+    Frames live in three slots: the one the caller holds, the newest complete
+    one, and the one being written. A frame returned by `read()` therefore
+    stays untouched until the next `read()` call; copy it to keep it longer.
+    """
+
+    def __init__(self, read_fn):
+        self.read_fn = read_fn
+        self._slots = [None, None, None]
+        self._latest = None  # slot with the newest complete frame
+        self._held = None  # slot returned by the last read()
+        self._ok = True
+        self._lock = threading.Lock()
+        self._new_frame = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="CaptureThread", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        """Stop the worker; return True once it has exited.
+
+        Returns False if it is still inside `read_fn` after `timeout`
+        seconds; the camera must then not be released under it.
+        """
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def read(self, timeout=1.0):
+        """Return (ok, frame) for the newest frame not yet returned.
+
+        Returns (False, None) if the camera failed or no frame arrived
+        within `timeout` seconds.
+        """
+        if not self._new_frame.wait(timeout):
+            return False, None
+        with self._lock:
+            self._new_frame.clear()
+            if not self._ok:
+                return False, None
+            self._held = self._latest
+            return True, self._slots[self._held]
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._lock:
+                slot = next(i for i in range(3) if i != self._latest and i != self._held)
+            try:
+                ok, frame = self.read_fn(self._slots[slot])
+            except Exception as e:
+                # e.g. camera unplugged; report it like a failed read
+                print(f"[CaptureThread] Camera read failed: {e}")
+                ok, frame = False, None
+            failed = not ok or frame is None
+            with self._lock:
+                if failed:
+                    self._ok = False
+                else:
+                    self._slots[slot] = frame
+                    self._latest = slot
+                self._new_frame.set()
+            if failed:
+                break
@@ -6,36 +6,73 @@ import yaml
 from typing import Optional
 import os
 
+from src.capture import CaptureThread
+from src.display import Cv2Display, FramebufferDisplay, FrameRateLimiter
+from src.drawing import cached_put_text, draw_hand_skeleton, landmarks_to_pixels
 from src.hand_tracker import HandTracker
 import src.gestures as gestures
 from src.robot_interface import MockRobot, SerialRobot, PiGPIORobot
 
-# Force OpenCV to use a specific backend for better VNC compatibility
-# Try GTK first, then Qt, then default
-try:
-    cv2.namedWindow("test", cv2.WINDOW_NORMAL)
-    cv2.destroyWindow("test")
-except:
-    pass
-
 # Try to import Picamera2 for Raspberry Pi Camera support
 try:
     from picamera2 import Picamera2
+    from libcamera import Transform
     PICAMERA2_AVAILABLE = True
 except ImportError:
     PICAMERA2_AVAILABLE = False
 
 
+def _configure_low_latency(cap, width=640, height=480, fps=30):
+    """Ask the driver for a 1-frame queue and cheap-to-decode MJPG frames.
+
+    V4L2 queues ~4 frames by default, so without this every processed frame
+    is ~100 ms old. Each property is only a request: backends that do not
+    support one return False and keep their default, so that is just logged.
+    """
+    settings = [
+        ("FOURCC", cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG")),
+        ("FRAME_WIDTH", cv2.CAP_PROP_FRAME_WIDTH, width),
+        ("FRAME_HEIGHT", cv2.CAP_PROP_FRAME_HEIGHT, height),
+        ("FPS", cv2.CAP_PROP_FPS, fps),
+        ("BUFFERSIZE", cv2.CAP_PROP_BUFFERSIZE, 1),
+    ]
+    for name, prop, value in settings:
+        if not cap.set(prop, value):
+            print(f"[DEBUG] Camera did not accept CAP_PROP_{name}={value}")
+
+
+def _open_capture(index, api=cv2.CAP_ANY):
+    """Open a VideoCapture and apply the low-latency settings if it opened."""
+    cap = cv2.VideoCapture(index, api)
+    if cap.isOpened():
+        _configure_low_latency(cap)
+    return cap
+
+
+def _probe_cv2_gui():
+    """Open and close a throwaway window so OpenCV picks its GUI backend early.
+
+    Only for the cv2 display: with no X a Qt build aborts the process here.
+    """
+    # Force OpenCV to use a specific backend for better VNC compatibility
+    # Try GTK first, then Qt, then default
+    try:
+        cv2.namedWindow("test", cv2.WINDOW_NORMAL)
+        cv2.destroyWindow("test")
+    except:
+        pass
+
+
 def draw_hand_info(frame, hand):
-    h, w = frame.shape[:2]
-    for (x, y, z) in hand["landmarks"]:
-        cx, cy = int(x * w), int(y * h)
-        cv2.circle(frame, (cx, cy), 3, (0, 255, 0), -1)
+    draw_hand_skeleton(frame, landmarks_to_pixels(hand["landmarks"], frame.shape))
     cv2.putText(frame, f"{hand['handedness']} {hand.get('score',0):.2f}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255,0,0), 2)
 
 
-def main(robot_type: str = "mock"):
+def main(robot_type: str = "mock", use_opencl: bool = False, display_fps: float = 15.0,
+         display_backend: str = "cv2"):
     print(f"[DEBUG] Starting demo with robot_type={robot_type}")
+    if display_backend != "fb":
+        _probe_cv2_gui()
     # instantiate robot
     if robot_type == "mock":
         robot = MockRobot()
@@ -54,8 +91,13 @@ def main(robot_type: str = "mock"):
     except Exception:
         cfg = None
 
-    tracker = HandTracker()
+    # Track on a 320 px wide copy of each frame; drawing uses the full frame
+    tracker = HandTracker(input_width=320, use_opencl=use_opencl)
     print("[DEBUG] HandTracker initialized")
+    # compile the gesture kernels now rather than stalling on the first hand
+    gestures.warm_up()
+    if use_opencl and not tracker.use_opencl:
+        print("[DEBUG] OpenCL not available, preprocessing frames on the CPU")
 
     # Try Picamera2 first (for Pi Camera), fallback to OpenCV
     picam2 = None
@@ -67,8 +109,14 @@ def main(robot_type: str = "mock"):
         try:
             print("[DEBUG] Attempting to use Picamera2...")
             picam2 = Picamera2()
-            # Configure for OpenCV-compatible format
-            config = picam2.create_preview_configuration(main={"format": "RGB888", "size": (640, 480)})
+            # BGR888 delivers frames in the byte order the rest of the pipeline
+            # expects (what RGB888 + cvtColor(RGB2BGR) used to produce), so no
+            # per-frame color conversion is needed
+            config = picam2.create_preview_configuration(
+                main={"format": "BGR888", "size": (640, 480)},
+                # The camera is mounted upside down; rotate 180° in the ISP
+                transform=Transform(hflip=True, vflip=True),
+            )
             picam2.configure(config)
             picam2.start()
             print("[DEBUG] Picamera2 initialized successfully")
@@ -83,7 +131,7 @@ def main(robot_type: str = "mock"):
         print("[DEBUG] Trying to open camera with different backends...")
         
         # Try V4L2 backend explicitly
-        cap = cv2.VideoCapture(0, cv2.CAP_V4L2)
+        cap = _open_capture(0, cv2.CAP_V4L2)
         if cap.isOpened():
             # Try to read a test frame
             ret, test_frame = cap.read()
@@ -92,10 +140,10 @@ def main(robot_type: str = "mock"):
             else:
                 print("[DEBUG] V4L2 backend opened but cannot read frames, trying default...")
                 cap.release()
-                cap = cv2.VideoCapture(0)
+                cap = _open_capture(0)
         else:
             print("[DEBUG] V4L2 backend failed, trying default backend...")
-            cap = cv2.VideoCapture(0)
+            cap = _open_capture(0)
         
         if not cap.isOpened():
             print("[ERROR] Failed to open camera at index 0")
@@ -112,7 +160,7 @@ def main(robot_type: str = "mock"):
             # Try other indices - Pi camera is often on video10-13
             for idx in [10, 11, 12, 13, 2, 1]:
                 print(f"[DEBUG] Trying /dev/video{idx}...")
-                cap = cv2.VideoCapture(idx, cv2.CAP_V4L2)
+                cap = _open_capture(idx, cv2.CAP_V4L2)
                 if cap.isOpened():
                     print(f"[DEBUG] /dev/video{idx} opened, testing frame read...")
                     # Give camera time to initialize
@@ -134,32 +182,46 @@ def main(robot_type: str = "mock"):
     last_gesture: Optional[str] = None
     last_sent = 0.0
 
+    # Capture on a background thread so the camera keeps delivering frames
+    # (and the V4L2 queue stays drained) while MediaPipe runs
+    if picam2 is not None:
+        capture = CaptureThread(lambda out: (True, picam2.capture_array()))
+    else:
+        capture = CaptureThread(cap.read)
+    capture.start()
+
+    # Showing a frame (especially over VNC) can cost more than tracking it,
+    # so the window is refreshed at most display_fps times per second
+    display_limiter = FrameRateLimiter(display_fps)
+    display = None
+
     try:
         print("[DEBUG] Entering main loop...")
         frame_count = 0
         
-        # Create window with specific flags for VNC compatibility
-        window_name = "Gesture → Robot Demo"
-        cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-        cv2.resizeWindow(window_name, 640, 480)
-        print(f"[DEBUG] Created window: {window_name}")
+        if display_backend == "fb":
+            # Straight to the console framebuffer (no X); quit with Ctrl+C
+            display = FramebufferDisplay()
+            print(f"[DEBUG] Writing frames to framebuffer ({display.width}x{display.height})")
+        else:
+            # Create window with specific flags for VNC compatibility
+            window_name = "Gesture → Robot Demo"
+            display = Cv2Display(window_name, (640, 480))
+            print(f"[DEBUG] Created window: {window_name}")
         
         while True:
-            # Capture frame from either Picamera2 or OpenCV
-            if picam2 is not None:
-                frame_raw = picam2.capture_array()
-                # Picamera2 returns RGB, convert to BGR for OpenCV/MediaPipe compatibility
-                frame = cv2.cvtColor(frame_raw, cv2.COLOR_RGB2BGR)
-                ret = True
-            else:
-                ret, frame = cap.read()
+            # Newest frame from either Picamera2 or OpenCV
+            ret, frame = capture.read()
             
             if not ret or frame is None:
                 print(f"[ERROR] Failed to read frame after {frame_count} frames")
                 break
             
-            # Flip the frame 180 degrees (camera is upside down)
-            frame = cv2.rotate(frame, cv2.ROTATE_180)
+            # Flip the frame 180 degrees (camera is upside down). Picamera2
+            # frames are already rotated by the ISP; OpenCV frames are flipped
+            # in place rather than copied into a new array
+            if picam2 is None:
+                cv2.flip(frame, -1, dst=frame)
             
             # Debug: Check if frame has data
             if frame_count == 0:
@@ -171,6 +233,8 @@ def main(robot_type: str = "mock"):
             frame_count += 1
             if frame_count == 1:
                 print(f"[DEBUG] First frame captured: {frame.shape}")
+            # Overlays are only drawn on frames that will be shown
+            show = display_limiter.ready()
 
             hands = tracker.process_frame(frame)
             gesture = None
@@ -180,40 +244,25 @@ def main(robot_type: str = "mock"):
                     print(f"[DEBUG] Detected {len(hands)} hand(s)")
                 # just process first hand for demo
                 hand = hands[0]
-                draw_hand_info(frame, hand)
+                landmarks = hand["landmarks"]
+                if show:
+                    draw_hand_info(frame, hand)
                 
                 # Detect gesture with direction
-                try:
-                    gesture_info = gestures.detect_gesture_with_direction(hand["landmarks"], hand.get("handedness"))
-                    gesture = gesture_info['gesture']
-                    direction = gesture_info['direction']
-                    combined_gesture = gesture_info['combined']
-                    
-                    if frame_count < 5 and gesture:
-                        print(f"[DEBUG] Detected gesture: {gesture}, direction: {direction}")
-                except (AttributeError, KeyError):
-                    # Fallback to simple gesture detection
-                    try:
-                        gesture = gestures.detect_gesture_with_handedness(hand["landmarks"], hand.get("handedness"))
-                        combined_gesture = gesture
-                        if frame_count < 5 and gesture:
-                            print(f"[DEBUG] Detected gesture: {gesture}")
-                    except AttributeError:
-                        try:
-                            gesture = gestures.detect_gesture(hand["landmarks"])
-                            combined_gesture = gesture
-                            if frame_count < 5 and gesture:
-                                print(f"[DEBUG] Detected gesture: {gesture}")
-                        except AttributeError:
-                            gesture = None
-                            combined_gesture = None
+                gesture_info = gestures.detect_gesture_with_direction(landmarks, hand.get("handedness"))
+                gesture = gesture_info['gesture']
+                direction = gesture_info['direction']
+                combined_gesture = gesture_info['combined']
+                
+                if frame_count < 5 and gesture:
+                    print(f"[DEBUG] Detected gesture: {gesture}, direction: {direction}")
                 
                 # Display gesture and direction
-                if gesture:
+                if gesture and show:
                     display_text = f"Gesture: {gesture}"
                     if direction:
                         display_text += f" -> {direction.upper()}"
-                    cv2.putText(frame, display_text, (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0,255,255), 2)
+                    cached_put_text(frame, display_text, (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0,255,255), 2)
 
             # send gesture to robot on change with debounce
             now = time.time()
@@ -233,38 +282,66 @@ def main(robot_type: str = "mock"):
                     robot.send_command(cmd)
                     last_gesture = current_gesture
                     last_sent = now
-            elif not gesture:
-                # Reset movement tracking when no hand detected
-                gestures.reset_movement_tracking()
+            # Commands queued this frame go out together (one serial write)
+            robot.flush()
+            if not hands:
+                # Reset movement tracking once the hand has been gone for a
+                # few frames (a brief tracking dropout keeps the history)
+                gestures.note_no_hand()
 
-            # Display the frame - force refresh
-            cv2.imshow(window_name, frame)
+            if not show:
+                continue
+
+            # Display the frame; with the cv2 backend this also pumps the
+            # GUI event loop (at the display rate) and returns the key pressed
+            key = display.show(frame)
             
             if frame_count == 1:
-                print("[DEBUG] First frame displayed in window")
+                print("[DEBUG] First frame displayed")
             
             # Check for 'q' key to quit
-            key = cv2.waitKey(1) & 0xFF
             if key == ord('q'):
                 print("[DEBUG] 'q' pressed, exiting...")
                 break
+    except KeyboardInterrupt:
+        print("[DEBUG] Interrupted, exiting...")
     except Exception as e:
         print(f"[ERROR] Exception in main loop: {e}")
         import traceback
         traceback.print_exc()
     finally:
         print("[DEBUG] Cleaning up...")
-        if picam2 is not None:
-            picam2.stop()
-            picam2.close()
-        if cap is not None:
-            cap.release()
-        cv2.destroyAllWindows()
+        if not capture.stop():
+            # The worker is still blocked in a camera read; releasing the
+            # camera under it could crash, so leave that to process exit
+            print("[DEBUG] Capture thread did not stop; not releasing the camera")
+        else:
+            if picam2 is not None:
+                picam2.stop()
+                picam2.close()
+            if cap is not None:
+                cap.release()
+        # Close the robot before the display so queued commands are flushed
+        # even if GUI teardown fails
+        try:
+            robot.close()
+        finally:
+            # Cv2Display.close destroys its own window; no destroyAllWindows,
+            # which raises on builds without a GUI
+            if display is not None:
+                display.close()
         print("[DEBUG] Demo ended")
 
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument("--robot", choices=["mock", "serial"], default="mock")
+    parser.add_argument("--opencl", action="store_true",
+                        help="resize/convert frames for hand tracking on an OpenCL device")
+    parser.add_argument("--display-fps", type=float, default=15.0,
+                        help="maximum window refresh rate (0 = every frame)")
+    parser.add_argument("--display", choices=["cv2", "fb"], default="cv2",
+                        help="cv2: OpenCV window (X/VNC); fb: write to /dev/fb0 (console, no X)")
     args = parser.parse_args()
-    main(robot_type=args.robot)
+    main(robot_type=args.robot, use_opencl=args.opencl, display_fps=args.display_fps,
+         display_backend=args.display)
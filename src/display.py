@@ -0,0 +1,105 @@
+"""Display helpers: keep showing frames from slowing down tracking."""
+import struct
+import time
+
+import cv2
+import numpy as np
+
+# linux/fb.h ioctls
+_FBIOGET_VSCREENINFO = 0x4600
+_FBIOGET_FSCREENINFO = 0x4602
+
+
+class FrameRateLimiter:
+    """Tell the caller when the next frame is due, at most `fps` times a second.
+
+    Usage:
+        limiter = FrameRateLimiter(15)
+        if limiter.ready():
+            cv2.imshow(window_name, frame)
+
+    `fps` <= 0 disables the limit (every call is ready).
+    """
+
+    def __init__(self, fps):
+        self.interval = 1.0 / fps if fps > 0 else 0.0
+        self._last = None
+
+    def ready(self):
+        now = time.monotonic()
+        if self._last is not None and now - self._last < self.interval:
+            return False
+        self._last = now
+        return True
+
+
+class Cv2Display:
+    """Show frames in an OpenCV HighGUI window (works under X and VNC)."""
+
+    def __init__(self, window_name, size=(640, 480)):
+        self.window_name = window_name
+        cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
+        cv2.resizeWindow(window_name, *size)
+
+    def show(self, frame):
+        """Display `frame`; return the pressed key code (0xFF if none)."""
+        cv2.imshow(self.window_name, frame)
+        return cv2.waitKey(1) & 0xFF
+
+    def close(self):
+        cv2.destroyWindow(self.window_name)
+
+
+class FramebufferDisplay:
+    """Write frames straight into the Linux framebuffer (/dev/fb0).
+
+    For running on the Pi's console without X: skips the GUI toolkit (and
+    any VNC hop) and the extra full-frame copies they make. Each frame is
+    converted once, into a reused buffer, to the framebuffer's pixel format
+    (32-bit BGRA or 16-bit RGB565) and copied into the memory-mapped screen
+    at the top-left corner, cropped to the screen size. There is no keyboard
+    input; stop the program with Ctrl+C.
+    """
+
+    _CONVERSIONS = {32: cv2.COLOR_BGR2BGRA, 16: cv2.COLOR_BGR2BGR565}
+
+    def __init__(self, device="/dev/fb0"):
+        # Linux only; imported here so the module still loads on Windows
+        import fcntl
+        import mmap
+
+        self._fd = open(device, "r+b", buffering=0)
+        try:
+            var = fcntl.ioctl(self._fd, _FBIOGET_VSCREENINFO, bytes(160))
+            self.width, self.height = struct.unpack_from("=II", var, 0)
+            bits_per_pixel = struct.unpack_from("=I", var, 24)[0]
+            fix = fcntl.ioctl(self._fd, _FBIOGET_FSCREENINFO, bytes(128))
+            # struct fb_fix_screeninfo: id, smem_start, smem_len, type,
+            # type_aux, visual, xpanstep, ypanstep, ywrapstep, line_length
+            line_length = struct.unpack_from("@16sLIIIIHHHI", fix)[-1]
+            if bits_per_pixel not in self._CONVERSIONS:
+                raise RuntimeError(f"unsupported framebuffer depth: {bits_per_pixel} bpp")
+            self._code = self._CONVERSIONS[bits_per_pixel]
+            self._bytes_per_pixel = bits_per_pixel // 8
+            self._mmap = mmap.mmap(self._fd.fileno(), line_length * self.height)
+        except Exception:
+            self._fd.close()
+            raise
+        self._screen = np.ndarray((self.height, line_length), dtype=np.uint8, buffer=self._mmap)
+        self._buf = None
+
+    def show(self, frame):
+        """Display `frame`; return 0xFF (the framebuffer has no key input)."""
+        h = min(frame.shape[0], self.height)
+        w = min(frame.shape[1], self.width)
+        frame = frame[:h, :w]
+        if self._buf is None or self._buf.shape[:2] != (h, w):
+            self._buf = np.empty((h, w, self._bytes_per_pixel), dtype=np.uint8)
+        cv2.cvtColor(frame, self._code, dst=self._buf)
+        self._screen[:h, :w * self._bytes_per_pixel] = self._buf.reshape(h, -1)
+        return 0xFF
+
+    def close(self):
+        self._screen = None
+        self._mmap.close()
+        self._fd.close()
@@ -0,0 +1,149 @@
+"""Drawing helpers shared by the demo and the calibration tool."""
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+# MediaPipe hand skeleton as polylines: one chain per finger (thumb and pinky
+# from the wrist) plus the knuckle line across the palm
+HAND_CHAINS = [
+    np.array([0, 1, 2, 3, 4]),
+    np.array([0, 5, 6, 7, 8]),
+    np.array([9, 10, 11, 12]),
+    np.array([13, 14, 15, 16]),
+    np.array([0, 17, 18, 19, 20]),
+    np.array([5, 9, 13, 17]),
+]
+FINGERTIPS = (4, 8, 12, 16, 20)
+_FINGERTIPS_IDX = np.array(FINGERTIPS)
+
+
+@lru_cache(maxsize=4)
+def _pixel_scale(w, h):
+    scale = np.array([w, h], dtype=np.float32)
+    scale.flags.writeable = False  # shared between calls
+    return scale
+
+
+def landmarks_to_pixels(landmarks, shape):
+    """Convert normalized landmarks to a (21, 2) int32 array of pixel coordinates.
+
+    `shape` is the frame's shape; the scale array is cached per frame size.
+    """
+    h, w = shape[:2]
+    return (np.asarray(landmarks, dtype=np.float32)[:, :2] * _pixel_scale(w, h)).astype(np.int32)
+
+
+def fingertip_points(pts):
+    """Fingertip pixel coordinates from `landmarks_to_pixels` as [x, y] int lists."""
+    return pts[_FINGERTIPS_IDX].tolist()
+
+
+def _blend_weights(image, mask):
+    """Per-pixel (keep, paint) uint16 weights for blending `image` by coverage `mask`.
+
+    frame * (255 - coverage) + premultiplied color, in uint16 math:
+    color <= coverage keeps the sum below 255 * 255 + 127
+    """
+    coverage = mask.astype(np.uint16)[:, :, None]
+    keep = np.repeat(255 - coverage, 3, axis=2)
+    paint = np.minimum(image, coverage) * 255 + 127
+    return keep, paint
+
+
+def _blend(roi, keep, paint):
+    """Blend pre-rendered content into the frame region `roi` (in place)."""
+    blended = roi.astype(np.uint16)
+    blended *= keep
+    blended += paint
+    blended //= 255
+    np.copyto(roi, blended, casting="unsafe")
+
+
+@lru_cache(maxsize=128)
+def _render_text(text, font, scale, color, thickness):
+    """Rasterize `text` once into a padded patch.
+
+    Returns (dx, dy, keep, paint): the patch's top-left corner relative to the
+    text origin and its blend weights.
+    """
+    (w, h), baseline = cv2.getTextSize(text, font, scale, thickness)
+    pad = thickness + 2  # stroke width and anti-aliasing spill past the text box
+    shape = (h + baseline + 2 * pad, w + 2 * pad)
+    image = np.zeros(shape + (3,), dtype=np.uint8)
+    mask = np.zeros(shape, dtype=np.uint8)
+    cv2.putText(image, text, (pad, pad + h), font, scale, color, thickness)
+    cv2.putText(mask, text, (pad, pad + h), font, scale, 255, thickness)
+    keep, paint = _blend_weights(image, mask)
+    return -pad, -pad - h, keep, paint
+
+
+def cached_put_text(frame, text, org, font, scale, color, thickness=1):
+    """Same result as cv2.putText, but each distinct string is rasterized once.
+
+    For labels that stay the same for many frames ("Gesture: open",
+    "Fingers: 3"): later calls only blend the cached patch into the frame.
+    The most recent 128 (text, font, scale, color, thickness) combinations
+    are kept.
+    """
+    dx, dy, keep, paint = _render_text(text, font, scale, tuple(color), thickness)
+    ph, pw = keep.shape[:2]
+    fh, fw = frame.shape[:2]
+    x0, y0 = org[0] + dx, org[1] + dy
+    # clip the patch to the frame
+    fx0, fy0 = max(x0, 0), max(y0, 0)
+    fx1, fy1 = min(x0 + pw, fw), min(y0 + ph, fh)
+    if fx0 >= fx1 or fy0 >= fy1:
+        return frame
+    patch = (slice(fy0 - y0, fy1 - y0), slice(fx0 - x0, fx1 - x0))
+    _blend(frame[fy0:fy1, fx0:fx1], keep[patch], paint[patch])
+    return frame
+
+
+def draw_hand_skeleton(frame, pts, color=(0, 255, 0), thickness=2):
+    """Draw the whole hand skeleton with a single cv2.polylines call.
+
+    `pts` is a (21, 2) int32 array of pixel coordinates.
+    """
+    cv2.polylines(frame, [pts[chain] for chain in HAND_CHAINS], False, color, thickness)
+
+
+class StaticOverlay:
+    """Overlay content that never changes, rasterized once and pasted per frame.
+
+    Usage:
+        overlay = StaticOverlay(frame.shape)
+        overlay.put_text("Press 'q' to quit", (10, 470), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        overlay.apply(frame)   # same result as calling cv2.putText on frame
+
+    Content is rendered once in color and once as a coverage mask. Per frame
+    only the bounding box of the drawn pixels is touched, blending in the
+    overlay by its coverage (opaque glyph pixels are replaced, anti-aliased
+    edges mixed, uncovered pixels kept).
+    """
+
+    def __init__(self, shape):
+        self.shape = tuple(shape[:2])
+        self.image = np.zeros(self.shape + (3,), dtype=np.uint8)
+        self.mask = np.zeros(self.shape, dtype=np.uint8)
+        self._roi = None  # (slice_y, slice_x) bounding box of the drawn pixels
+        self._keep = None  # per pixel in the ROI, 255 - coverage
+        self._paint = None  # per pixel in the ROI, 255 * (premultiplied) color
+
+    def put_text(self, text, org, font, scale, color, thickness=1):
+        cv2.putText(self.image, text, org, font, scale, color, thickness)
+        cv2.putText(self.mask, text, org, font, scale, 255, thickness)
+        self._update()
+
+    def _update(self):
+        ys, xs = np.nonzero(self.mask)
+        if len(ys) == 0:
+            return
+        self._roi = (slice(ys.min(), ys.max() + 1), slice(xs.min(), xs.max() + 1))
+        self._keep, self._paint = _blend_weights(self.image[self._roi], self.mask[self._roi])
+
+    def apply(self, frame):
+        """Draw the overlay onto `frame` (in place) and return it."""
+        if self._roi is not None:
+            _blend(frame[self._roi], self._keep, self._paint)
+        return frame
@@ -1,140 +1,260 @@
 """Simple rule-based gesture recognizers using hand landmarks.
 
-Landmarks: list of 21 (x,y,z) tuples as returned by HandTracker.
+Landmarks: (21, 3) float32 array of normalized (x,y,z) points as returned by
+HandTracker. Lists of 21 (x,y,z) tuples are still accepted and converted.
+
+Distances (pinch, fingertip reach, hand movement) use only x and y; z is
+MediaPipe's relative depth estimate and too noisy for them. Only the joint
+angles in finger counting use all three coordinates.
 """
 import math
-from typing import List, Tuple, Optional, Dict
+from typing import Sequence, Tuple, Optional, Dict, List, Union
+
+import numpy as np
+
+try:
+    from numba import njit
+except Exception:  # numba is optional; the NumPy path is used without it
+    njit = None
 
-Landmark = Tuple[float, float, float]
+Landmark = Union[Tuple[float, float, float], np.ndarray]
+Landmarks = Union[np.ndarray, Sequence[Tuple[float, float, float]]]
 
-# Store previous hand position for direction tracking
-_prev_hand_center: Optional[Tuple[float, float]] = None
+# Direction tracking defaults (see MovementTracker)
 _movement_threshold = 0.05  # Minimum movement to trigger direction detection
+# While the wrist stays within this distance of its position at the last
+# direction update, the hand is treated as stationary
+_still_threshold = 0.005
+# Consecutive frames without a hand before movement tracking is reset, so a
+# hand that drops out of tracking for a frame or two keeps its history
+NO_HAND_RESET_FRAMES = 3
 
+# Per-finger joint indices (thumb, index, middle, ring, pinky); the bend
+# angle is measured at the middle joint of each triple.
+_MCP = np.array([2, 5, 9, 13, 17])
+_PIP = np.array([3, 6, 10, 14, 18])
+_TIP = np.array([4, 8, 12, 16, 20])
+# The same triples stacked per finger: (5, 3) rows of (MCP, PIP, TIP)
+_FINGER_JOINTS = np.stack([_MCP, _PIP, _TIP], axis=1)
 
-def _dist(a: Landmark, b: Landmark) -> float:
-    return math.hypot(a[0] - b[0], a[1] - b[1])
+# Gesture name by extended finger count
+_FINGER_NAMES = ("fist", "one", "two", "three", "four", "five")
 
+# Angle threshold: if the joint angle is above this, the finger is extended.
+# Adjustable - lower = stricter, higher = more lenient.
+EXTENDED_ANGLE = 140.0
+# acos is decreasing, so angle > EXTENDED_ANGLE  <=>  cos < _COS_EXTENDED
+_COS_EXTENDED = math.cos(math.radians(EXTENDED_ANGLE))  # ≈ -0.766
 
-def _angle_between(a: Landmark, b: Landmark, c: Landmark) -> float:
-    """Return angle (degrees) at point b for triangle a-b-c.
+# Pinch: thumb tip and index tip closer than this (normalized units).
+# Raise it if pinches are missed, lower it if they trigger too easily.
+PINCH_THRESHOLD = 0.05
 
-    Angle between vectors ba and bc.
-    """
-    # vectors: v1 = a - b, v2 = c - b
-    v1 = (a[0] - b[0], a[1] - b[1], a[2] - b[2])
-    v2 = (c[0] - b[0], c[1] - b[1], c[2] - b[2])
-    dot = v1[0] * v2[0] + v1[1] * v2[1] + v1[2] * v2[2]
-    n1 = math.sqrt(v1[0] ** 2 + v1[1] ** 2 + v1[2] ** 2)
-    n2 = math.sqrt(v2[0] ** 2 + v2[1] ** 2 + v2[2] ** 2)
-    if n1 == 0 or n2 == 0:
-        return 180.0
-    cosang = max(-1.0, min(1.0, dot / (n1 * n2)))
-    return math.degrees(math.acos(cosang))
-
-
-def is_pinch(landmarks: List[Landmark], thresh: float = 0.05) -> bool:
+# Finger counting: the thumb also counts when its tip is this far from the
+# wrist, and the other fingertips may sit up to TIP_MARGIN below their MCP.
+THUMB_REACH = 0.15
+TIP_MARGIN = 0.05
+_THUMB_REACH2 = THUMB_REACH * THUMB_REACH
+
+
+def _jit(fn):
+    """Compile `fn` with numba when it is installed, else return it unchanged."""
+    if njit is None:
+        return fn
+    return njit(cache=True, fastmath=True)(fn)
+
+
+def _as_array(landmarks: Landmarks) -> np.ndarray:
+    """Return landmarks as a contiguous float32 array (no copy if already one)."""
+    return np.ascontiguousarray(landmarks, dtype=np.float32)
+
+
+def _dist2(a: Landmark, b: Landmark) -> float:
+    """Squared 2D distance (z ignored); compare it to a squared threshold to skip the sqrt."""
+    dx = a[0] - b[0]
+    dy = a[1] - b[1]
+    return dx * dx + dy * dy
+
+
+def _tip_distances(L: np.ndarray) -> np.ndarray:
+    """2D wrist to fingertip distances (thumb..pinky) for a (21, 3) float32 array."""
+    if njit is not None:
+        return _tip_distances_nb(L)
+    return _tip_distances_np(L)
+
+
+def _tip_distances_np(L: np.ndarray) -> np.ndarray:
+    # gather only the x, y columns of the wrist and tips
+    d = L[_TIP, :2] - L[0, :2]
+    return np.hypot(d[:, 0], d[:, 1])
+
+
+def _tip_wrist_mean(L: np.ndarray) -> float:
+    """Mean wrist to fingertip distance; is_fist and is_open_hand threshold it."""
+    # summing the list beats ndarray.mean() call overhead for five values
+    return sum(_tip_distances(L).tolist()) / 5
+
+
+def is_pinch(landmarks: Landmarks, thresh: float = PINCH_THRESHOLD) -> bool:
     """Detect a simple pinch: thumb tip (4) close to index tip (8)."""
-    if not landmarks or len(landmarks) < 9:
+    if landmarks is None or len(landmarks) < 9:
         return False
-    thumb_tip = landmarks[4]
-    index_tip = landmarks[8]
-    return _dist(thumb_tip, index_tip) < thresh
+    return _is_pinch_unchecked(landmarks, thresh)
+
+
+def _is_pinch_unchecked(L: Landmarks, thresh: float = PINCH_THRESHOLD) -> bool:
+    """is_pinch without the length check, for landmarks already validated."""
+    return _dist2(L[4], L[8]) < thresh * thresh
 
 
-def is_fist(landmarks: List[Landmark], thresh: float = 0.08) -> bool:
+def is_fist(landmarks: Landmarks, thresh: float = 0.08) -> bool:
     """Rough fist detection: average distance of finger tips to wrist is small."""
-    if not landmarks or len(landmarks) < 21:
+    if landmarks is None or len(landmarks) < 21:
         return False
-    wrist = landmarks[0]
-    tips = [landmarks[i] for i in (4, 8, 12, 16, 20)]
-    avg = sum(_dist(wrist, t) for t in tips) / len(tips)
-    return avg < thresh
+    return _tip_wrist_mean(_as_array(landmarks)) < thresh
 
 
-def is_open_hand(landmarks: List[Landmark], thresh: float = 0.12) -> bool:
+def is_open_hand(landmarks: Landmarks, thresh: float = 0.12) -> bool:
     """Detect open hand: finger tips are far from wrist on average."""
-    if not landmarks or len(landmarks) < 21:
+    if landmarks is None or len(landmarks) < 21:
         return False
-    wrist = landmarks[0]
-    tips = [landmarks[i] for i in (4, 8, 12, 16, 20)]
-    avg = sum(_dist(wrist, t) for t in tips) / len(tips)
-    return avg > thresh
+    return _tip_wrist_mean(_as_array(landmarks)) > thresh
 
 
-def get_hand_center(landmarks: List[Landmark]) -> Tuple[float, float]:
+def get_hand_center(landmarks: Landmarks) -> Tuple[float, float]:
     """Calculate the center point of the hand (average of all landmarks)."""
-    if not landmarks:
+    if landmarks is None or len(landmarks) == 0:
         return (0.0, 0.0)
-    x_sum = sum(lm[0] for lm in landmarks)
-    y_sum = sum(lm[1] for lm in landmarks)
+    if isinstance(landmarks, np.ndarray):
+        x_sum, y_sum = landmarks[:, :2].sum(axis=0).tolist()
+    else:
+        # one pass over the landmarks for both coordinates
+        x_sum = y_sum = 0.0
+        for lm in landmarks:
+            x_sum += lm[0]
+            y_sum += lm[1]
     return (x_sum / len(landmarks), y_sum / len(landmarks))
 
 
-def detect_movement_direction(landmarks: List[Landmark]) -> Optional[str]:
-    """Detect if hand is moving in a direction (left, right, up, down).
-    
-    Returns direction string or None if not enough movement detected.
+class MovementTracker:
+    """Movement direction state for one hand.
+
+    The module-level functions (detect_movement_direction,
+    reset_movement_tracking, note_no_hand) share a default instance; create
+    one tracker per camera or hand to follow them independently, e.g. from
+    separate threads.
     """
-    global _prev_hand_center
-    
-    current_center = get_hand_center(landmarks)
-    
-    if _prev_hand_center is None:
-        _prev_hand_center = current_center
-        return None
-    
-    # Calculate movement delta
-    dx = current_center[0] - _prev_hand_center[0]
-    dy = current_center[1] - _prev_hand_center[1]
-    
-    # Update previous position
-    _prev_hand_center = current_center
-    
-    # Check if movement exceeds threshold
-    movement = math.sqrt(dx * dx + dy * dy)
-    if movement < _movement_threshold:
-        return None
-    
-    # Determine primary direction (larger movement wins)
-    if abs(dx) > abs(dy):
-        # Horizontal movement
-        if dx > 0:
-            return "right"
-        else:
-            return "left"
-    else:
-        # Vertical movement
-        if dy > 0:
-            return "down"
+
+    __slots__ = ("prev_center", "prev_wrist", "threshold", "still_threshold", "no_hand_streak")
+
+    def __init__(self, threshold: float = _movement_threshold, still_threshold: float = _still_threshold):
+        self.prev_center: Optional[Tuple[float, float]] = None
+        self.prev_wrist: Optional[Tuple[float, float]] = None  # wrist at the last update
+        self.threshold = threshold
+        self.still_threshold = still_threshold
+        self.no_hand_streak = 0
+
+    def direction(self, landmarks: Landmarks) -> Optional[str]:
+        """Detect if hand is moving in a direction (left, right, up, down).
+
+        Returns direction string or None if not enough movement detected.
+        Frames where the wrist has barely moved since the last update return
+        None straight away, without recomputing the hand center.
+        """
+        self.no_hand_streak = 0
+        if landmarks is not None and len(landmarks) > 0:
+            wrist = (float(landmarks[0][0]), float(landmarks[0][1]))
+            if (self.prev_center is not None and self.prev_wrist is not None
+                    and _dist2(wrist, self.prev_wrist) < self.still_threshold * self.still_threshold):
+                return None
+            self.prev_wrist = wrist
+
+        current_center = get_hand_center(landmarks)
+
+        if self.prev_center is None:
+            self.prev_center = current_center
+            return None
+
+        # Calculate movement delta
+        dx = current_center[0] - self.prev_center[0]
+        dy = current_center[1] - self.prev_center[1]
+
+        # Update previous position
+        self.prev_center = current_center
+
+        # Check if movement exceeds threshold
+        if dx * dx + dy * dy < self.threshold * self.threshold:
+            return None
+
+        # Determine primary direction (larger movement wins)
+        if abs(dx) > abs(dy):
+            # Horizontal movement
+            if dx > 0:
+                return "right"
+            else:
+                return "left"
         else:
-            return "up"
+            # Vertical movement
+            if dy > 0:
+                return "down"
+            else:
+                return "up"
+
+    def reset(self):
+        """Forget the previous position (no-op if there is none)."""
+        if self.prev_center is None and self.prev_wrist is None:
+            return
+        self.prev_center = None
+        self.prev_wrist = None
 
+    def note_no_hand(self):
+        """Call once per frame in which no hand was detected.
 
-def reset_movement_tracking():
+        Resets once NO_HAND_RESET_FRAMES frames in a row had no hand; the
+        next direction() call ends the streak.
+        """
+        self.no_hand_streak += 1
+        if self.no_hand_streak == NO_HAND_RESET_FRAMES:
+            self.reset()
+
+
+_default_tracker = MovementTracker()
+
+
+def detect_movement_direction(landmarks: Landmarks, tracker: Optional[MovementTracker] = None) -> Optional[str]:
+    """Movement direction of the hand; see MovementTracker.direction.
+
+    Uses the module's default tracker unless `tracker` is given.
+    """
+    return (tracker if tracker is not None else _default_tracker).direction(landmarks)
+
+
+def reset_movement_tracking(tracker: Optional[MovementTracker] = None):
     """Reset the movement tracking (call when starting fresh or gesture changes)."""
-    global _prev_hand_center
-    _prev_hand_center = None
+    (tracker if tracker is not None else _default_tracker).reset()
+
 
+def note_no_hand(tracker: Optional[MovementTracker] = None):
+    """Call once per frame in which no hand was detected; see MovementTracker.note_no_hand."""
+    (tracker if tracker is not None else _default_tracker).note_no_hand()
 
-def is_pointing_index(landmarks: List[Landmark], thresh: float = 0.06) -> bool:
+
+def is_pointing_index(landmarks: Landmarks, thresh: float = 0.06) -> bool:
     """Index pointing: index tip far from wrist while other fingertips relatively close."""
-    if not landmarks or len(landmarks) < 21:
+    if landmarks is None or len(landmarks) < 21:
         return False
-    wrist = landmarks[0]
-    index_tip = landmarks[8]
-    other_tips = [landmarks[i] for i in (4, 12, 16, 20)]
-    index_dist = _dist(wrist, index_tip)
-    others_avg = sum(_dist(wrist, t) for t in other_tips) / len(other_tips)
+    d = _tip_distances(_as_array(landmarks)).tolist()
+    index_dist = d[1]
+    others_avg = (sum(d) - index_dist) / 4
     return index_dist > others_avg + thresh
 
 
-def detect_gesture(landmarks: List[Landmark]) -> Optional[str]:
+def detect_gesture(landmarks: Landmarks) -> Optional[str]:
     """Return a gesture string or None."""
     return detect_gesture_with_handedness(landmarks, None)
 
 
-def detect_gesture_with_handedness(landmarks: List[Landmark], handedness: Optional[str] = None) -> Optional[str]:
+def detect_gesture_with_handedness(landmarks: Landmarks, handedness: Optional[str] = None) -> Optional[str]:
     """Return a gesture string or None. Accepts optional handedness ('Left'|'Right').
 
     Rules (priority):
@@ -142,41 +262,73 @@ def detect_gesture_with_handedness(landmarks: List[Landmark], handedness: Option
     2. fist (all fingers closed)
     3. finger counting (1, 2, 3, 4, or 5 fingers)
     """
-    # Check pinch first (highest priority)
-    if is_pinch(landmarks):
+    if landmarks is None or len(landmarks) < 21:
+        # Partial hands can still pinch but never have extended fingers
+        return "pinch" if is_pinch(landmarks) else "fist"
+    return _detect_gesture_np(_as_array(landmarks))
+
+
+def _detect_gesture_np(L: np.ndarray) -> Optional[str]:
+    """detect_gesture_with_handedness for a validated (21, 3) float32 array."""
+    if njit is not None:
+        # One compiled call covers both the pinch test and the finger count
+        pinch, n = _classify_nb(L, PINCH_THRESHOLD)
+    else:
+        # Pinch only needs landmarks 4 and 8; the finger geometry is skipped
+        # when it fires
+        pinch = _is_pinch_unchecked(L)
+        n = 0 if pinch else _count_ext_np(L)
+    return _gesture_name(pinch, n)
+
+
+def _gesture_name(pinch: bool, n: int) -> Optional[str]:
+    """Gesture for a pinch flag and an extended finger count."""
+    # Pinch has the highest priority
+    if pinch:
         return "pinch"
-    
-    # Count extended fingers
-    n = count_extended_fingers(landmarks, handedness)
-    
-    # Map finger count to gestures
-    if n == 0:
-        return "fist"
-    elif n == 1:
-        return "one"
-    elif n == 2:
-        return "two"
-    elif n == 3:
-        return "three"
-    elif n == 4:
-        return "four"
-    elif n == 5:
-        return "five"
-
-    return None
-
-
-def detect_gesture_with_direction(landmarks: List[Landmark], handedness: Optional[str] = None) -> Dict[str, Optional[str]]:
+    return _FINGER_NAMES[n] if 0 <= n <= 5 else None
+
+
+def detect_gestures_batch(hands: Union[np.ndarray, Sequence[Landmarks]]) -> List[Optional[str]]:
+    """detect_gesture_with_handedness for several hands at once.
+
+    `hands` is an (N, 21, 3) array or N full sets of 21 landmarks, e.g. the
+    "landmarks" of every hand HandTracker returned. All hands are classified
+    in one vectorized (or compiled) pass; returns N gesture names. A single
+    (21, 3) hand is treated as N = 1; any other shape raises ValueError.
+    """
+    B = np.ascontiguousarray(hands, dtype=np.float32)
+    if B.size == 0:
+        return []
+    if B.ndim not in (2, 3) or B.shape[-2:] != (21, 3):
+        raise ValueError(f"expected (N, 21, 3) landmarks, got shape {B.shape}")
+    B = B.reshape(-1, 21, 3)
+    if njit is not None:
+        pinch, counts = _classify_batch_nb(B, PINCH_THRESHOLD)
+    else:
+        pinch, counts = _classify_batch_np(B, PINCH_THRESHOLD)
+    return [_gesture_name(p, n) for p, n in zip(pinch.tolist(), counts.tolist())]
+
+
+def detect_gesture_with_direction(landmarks: Landmarks, handedness: Optional[str] = None,
+                                  tracker: Optional[MovementTracker] = None) -> Dict[str, Optional[str]]:
     """Return both gesture and movement direction.
-    
+
+    Movement is followed by `tracker`, or the module's default tracker.
+
     Returns:
         dict with keys:
         - 'gesture': the base gesture (one, two, three, etc.)
         - 'direction': movement direction (left, right, up, down) or None
         - 'combined': combined gesture+direction string (e.g., "two_left") or just gesture
     """
-    gesture = detect_gesture_with_handedness(landmarks, handedness)
-    direction = detect_movement_direction(landmarks)
+    if landmarks is None or len(landmarks) < 21:
+        gesture = detect_gesture_with_handedness(landmarks, handedness)
+    else:
+        # Convert once; the classifier and the movement tracker share the array
+        landmarks = _as_array(landmarks)
+        gesture = _detect_gesture_np(landmarks)
+    direction = detect_movement_direction(landmarks, tracker)
     
     result = {
         'gesture': gesture,
@@ -191,15 +343,16 @@ def detect_gesture_with_direction(landmarks: List[Landmark], handedness: Optiona
     return result
 
 
-def count_extended_fingers(landmarks: List[Landmark], handedness: Optional[str] = None) -> int:
+def count_extended_fingers(landmarks: Landmarks, handedness: Optional[str] = None) -> int:
     """Return number of extended fingers (0-5).
 
-    Improved method using angle-based detection:
-    - For each finger, check if it's extended by measuring the angle at joints
-    - A straighter angle (closer to 180°) indicates an extended finger
-    - Adjustable threshold for better accuracy
+    Angle-based detection, evaluated for all five fingers at once:
+    - For each finger, measure the angle at the middle joint
+    - A straighter angle (closer to 180°) than EXTENDED_ANGLE indicates an
+      extended finger
+    - Angles are compared in the cosine domain, so no acos is needed
     """
-    if not landmarks or len(landmarks) < 21:
+    if landmarks is None or len(landmarks) < 21:
         return 0
 
     # MediaPipe hand landmark indices:
@@ -208,48 +361,160 @@ def count_extended_fingers(landmarks: List[Landmark], handedness: Optional[str]
     # Middle: 9(MCP), 10(PIP), 11(DIP), 12(TIP)
     # Ring: 13(MCP), 14(PIP), 15(DIP), 16(TIP)
     # Pinky: 17(MCP), 18(PIP), 19(DIP), 20(TIP)
-    
-    extended = 0
-    
-    # Angle threshold: if angle > this value, finger is extended
-    angle_threshold = 140.0  # Adjustable - lower = stricter, higher = more lenient
-    
-    # Check thumb (special case - uses different joints)
-    try:
-        # Thumb: check angle at IP joint (index 3)
-        thumb_angle = _angle_between(landmarks[2], landmarks[3], landmarks[4])
-        # Also check if thumb tip is far from palm
-        thumb_tip_dist = _dist(landmarks[0], landmarks[4])  # wrist to thumb tip
-        palm_center = landmarks[0]  # wrist as reference
-        
-        # Thumb is extended if angle is large OR tip is far from palm
-        if thumb_angle > angle_threshold or thumb_tip_dist > 0.15:
-            extended += 1
-    except Exception:
-        pass
-    
-    # Check other four fingers (index, middle, ring, pinky)
-    finger_joints = [
-        (5, 6, 8),   # Index: MCP, PIP, TIP
-        (9, 10, 12),  # Middle: MCP, PIP, TIP
-        (13, 14, 16), # Ring: MCP, PIP, TIP
-        (17, 18, 20), # Pinky: MCP, PIP, TIP
-    ]
-    
-    for mcp_i, pip_i, tip_i in finger_joints:
-        try:
-            # Calculate angle at PIP joint
-            angle = _angle_between(landmarks[mcp_i], landmarks[pip_i], landmarks[tip_i])
-            
-            # Also check if tip is above (y coordinate smaller) the MCP joint
-            # This helps when hand is tilted
-            tip_y = landmarks[tip_i][1]
-            mcp_y = landmarks[mcp_i][1]
-            
-            # Finger is extended if angle is large AND tip is higher than base
-            if angle > angle_threshold and tip_y < mcp_y + 0.05:
-                extended += 1
-        except Exception:
-            continue
-
-    return extended
+    L = _as_array(landmarks)
+    if njit is not None:
+        return _count_ext_nb(L)
+    return _count_ext_np(L)
+
+
+def _count_ext_np(L: np.ndarray) -> int:
+    """Vectorized finger count for a (21, 3) float32 array."""
+    wrist_to_tip, cos5 = _compute_features(L)
+    return _count_from_features(L, wrist_to_tip, cos5)
+
+
+def _compute_features(L: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute the per-frame geometry the finger count is derived from.
+
+    Returns (wrist_to_tip, cos5) for a (21, 3) float32 array: wrist to
+    fingertip distances (thumb..pinky) and the cosine of each finger's
+    middle-joint angle.
+    """
+    return _tip_distances_np(L), _joint_cos(L)
+
+
+def _joint_cos(L: np.ndarray) -> np.ndarray:
+    """Cosine of each finger's middle-joint angle (thumb..pinky).
+
+    `L` is (..., 21, 3); the result is (..., 5). A zero-length segment counts
+    as a straight (180°) joint, i.e. -1.0.
+    """
+    tri = L[..., _FINGER_JOINTS, :]  # (..., 5, 3, 3)
+    v = tri[..., 0::2, :] - tri[..., 1:2, :]  # (..., 5, 2, 3): PIP->MCP, PIP->TIP
+    gram = np.einsum('...ik,...jk->...ij', v, v)  # dot products of the two vectors
+    dot = gram[..., 0, 1]
+    norms = np.sqrt(gram[..., 0, 0] * gram[..., 1, 1])
+    return np.divide(dot, norms, out=np.full(norms.shape, -1.0, dtype=np.float32), where=norms > 0)
+
+
+def _count_from_features(L: np.ndarray, wrist_to_tip: np.ndarray, cos5: np.ndarray) -> int:
+    """Number of extended fingers given the output of `_compute_features`."""
+    straight = cos5 < _COS_EXTENDED
+
+    # Thumb is extended if angle is large OR tip is far from the wrist
+    thumb = bool(straight[0]) or wrist_to_tip[0] > THUMB_REACH
+
+    # Other fingers also need the tip above (y smaller than) the MCP joint,
+    # which helps when the hand is tilted
+    fingers = straight[1:] & (L[_TIP[1:], 1] < L[_MCP[1:], 1] + TIP_MARGIN)
+
+    return int(thumb) + int(fingers.sum())
+
+
+def _classify_batch_np(B: np.ndarray, pinch_thresh: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized (is_pinch, finger count) per hand for an (N, 21, 3) array.
+
+    Same rules as _count_from_features; counts of pinching hands are 0.
+    """
+    d = B[:, 4, :2] - B[:, 8, :2]
+    pinch = np.einsum('ij,ij->i', d, d) < pinch_thresh * pinch_thresh
+    reach = B[:, 4, :2] - B[:, 0, :2]
+    straight = _joint_cos(B) < _COS_EXTENDED
+    thumb = straight[:, 0] | (np.einsum('ij,ij->i', reach, reach) > _THUMB_REACH2)
+    fingers = straight[:, 1:] & (B[:, _TIP[1:], 1] < B[:, _MCP[1:], 1] + TIP_MARGIN)
+    counts = thumb + fingers.sum(axis=1)
+    counts[pinch] = 0
+    return pinch, counts
+
+
+# Compiled kernels (numba). Without numba installed `_jit` leaves these as
+# plain Python, which keeps them testable but slower than the NumPy path, so
+# they are only dispatched to when `njit` is available.
+
+@_jit
+def _tip_distances_nb(L):
+    """Wrist to fingertip distances (thumb..pinky); see _tip_distances."""
+    out = np.empty(5, dtype=np.float32)
+    for f in range(5):
+        t = _TIP[f]
+        out[f] = math.hypot(L[t, 0] - L[0, 0], L[t, 1] - L[0, 1])
+    return out
+
+
+@_jit
+def _dist2_nb(L, a, b):
+    """Squared 2D distance between landmarks a and b of L."""
+    dx = L[a, 0] - L[b, 0]
+    dy = L[a, 1] - L[b, 1]
+    return dx * dx + dy * dy
+
+
+@_jit
+def _joint_cos_nb(L, a, b, c):
+    """Cosine of the angle at landmark b of L, -1.0 for a zero-length side."""
+    v1x = L[a, 0] - L[b, 0]
+    v1y = L[a, 1] - L[b, 1]
+    v1z = L[a, 2] - L[b, 2]
+    v2x = L[c, 0] - L[b, 0]
+    v2y = L[c, 1] - L[b, 1]
+    v2z = L[c, 2] - L[b, 2]
+    n = math.sqrt((v1x * v1x + v1y * v1y + v1z * v1z) * (v2x * v2x + v2y * v2y + v2z * v2z))
+    if n == 0.0:
+        return -1.0
+    return (v1x * v2x + v1y * v2y + v1z * v2z) / n
+
+
+@_jit
+def _count_ext_nb(L):
+    """Finger count for a contiguous (21, 3) float32 array; see count_extended_fingers."""
+    n = 0
+    if (_joint_cos_nb(L, 2, 3, 4) < _COS_EXTENDED
+            or _dist2_nb(L, 4, 0) > _THUMB_REACH2):
+        n += 1
+    for f in range(1, 5):
+        m = _MCP[f]
+        t = _TIP[f]
+        if _joint_cos_nb(L, m, _PIP[f], t) < _COS_EXTENDED and L[t, 1] < L[m, 1] + TIP_MARGIN:
+            n += 1
+    return n
+
+
+@_jit
+def _classify_nb(L, pinch_thresh):
+    """Return (is_pinch, extended finger count) for a (21, 3) float32 array.
+
+    The count is only computed when the hand is not pinching, matching the
+    priority order of detect_gesture_with_handedness.
+    """
+    if _dist2_nb(L, 4, 8) < pinch_thresh * pinch_thresh:
+        return True, 0
+    return False, _count_ext_nb(L)
+
+
+@_jit
+def _classify_batch_nb(B, pinch_thresh):
+    """_classify_nb for each hand of an (N, 21, 3) float32 array."""
+    n = B.shape[0]
+    pinch = np.zeros(n, dtype=np.bool_)
+    counts = np.zeros(n, dtype=np.int64)
+    for i in range(n):
+        p, c = _classify_nb(B[i], pinch_thresh)
+        pinch[i] = p
+        counts[i] = c
+    return pinch, counts
+
+
+def warm_up() -> None:
+    """Compile the numba kernels now instead of on the first detected hand.
+
+    numba compiles lazily, which stalls the first frames with a hand for
+    about a second (several on a Pi, or when the on-disk cache cannot be
+    written). Call this during startup; it is a no-op without numba.
+    """
+    if njit is None:
+        return
+    L = np.zeros((21, 3), dtype=np.float32)
+    _classify_nb(L, PINCH_THRESHOLD)
+    _count_ext_nb(L)
+    _tip_distances_nb(L)
+    _classify_batch_nb(L[None], PINCH_THRESHOLD)
@@ -13,20 +13,41 @@ class HandTracker:
     Usage:
         tracker = HandTracker(max_num_hands=2)
         hands = tracker.process_frame(frame)
-        # hands -> list of {landmarks: [(x,y,z),...], handedness: 'Left'|'Right', score: float}
+        # hands -> list of {landmarks: ndarray (21,3) of (x,y,z), handedness: 'Left'|'Right', score: float}
+
+    Create one tracker and reuse it for every frame of a video stream. In
+    video mode MediaPipe tracks the hand from the previous frame's landmarks
+    and only reruns the (expensive) palm detector when tracking confidence
+    drops below `min_tracking_confidence`; a new tracker per frame runs
+    palm detection every time. A higher `min_detection_confidence` costs
+    nothing per frame but avoids locking on to false palms, while a lower
+    `min_tracking_confidence` keeps tracking (and skips redetection) longer.
+
+    `input_width` downscales frames wider than that (keeping aspect ratio)
+    before they reach MediaPipe, whose models run at ~224 px anyway. The
+    landmarks are normalized, so they still line up with the full frame.
+    None feeds frames at their original size.
+
+    `use_opencl` runs that resize and the BGR->RGB conversion through
+    OpenCV's transparent API (cv2.UMat) on an OpenCL device, downloading only
+    the small RGB image MediaPipe needs. It is ignored (``self.use_opencl``
+    stays False) when OpenCV reports no OpenCL support.
     """
 
-    def __init__(self, max_num_hands=2, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+    def __init__(self, max_num_hands=2, min_detection_confidence=0.7, min_tracking_confidence=0.5,
+                 input_width=None, use_opencl=False):
         self.max_num_hands = max_num_hands
         self.min_detection_confidence = min_detection_confidence
         self.min_tracking_confidence = min_tracking_confidence
+        self.input_width = input_width
+        self.use_opencl = bool(use_opencl) and cv2.ocl.haveOpenCL()
 
         if mp is None:
             raise RuntimeError("mediapipe not available; install mediapipe to use HandTracker")
 
         self.mp_hands = mp.solutions.hands
         self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
+            static_image_mode=False,  # video mode: reuse landmarks between frames
             max_num_hands=self.max_num_hands,
             min_detection_confidence=self.min_detection_confidence,
             min_tracking_confidence=self.min_tracking_confidence,
@@ -35,18 +56,32 @@ class HandTracker:
     def process_frame(self, frame_bgr):
         """Process a BGR OpenCV frame and return detected hands as normalized landmarks.
 
-        Returns list of dicts: {landmarks: [(x,y,z),...], handedness: str, score: float}
+        Returns list of dicts: {landmarks: ndarray, handedness: str, score: float}.
+        ``landmarks`` is a (21, 3) float32 array of normalized (x, y, z) points;
+        iterating it yields one row per landmark, like the old list of tuples.
+        It is built once per hand and is C-contiguous float32, so the
+        functions in ``src.gestures`` use it without converting or copying.
         """
-        img_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+        h, w = frame_bgr.shape[:2]
+        img = cv2.UMat(frame_bgr) if self.use_opencl else frame_bgr
+        if self.input_width and w > self.input_width:
+            size = (self.input_width, round(h * self.input_width / w))
+            img = cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        if self.use_opencl:
+            img_rgb = img_rgb.get()  # MediaPipe needs a numpy array
         results = self.hands.process(img_rgb)
         out = []
         if not results.multi_hand_landmarks:
             return out
 
         for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
-            lm = []
-            for p in hand_landmarks.landmark:
-                lm.append((p.x, p.y, p.z))
+            points = hand_landmarks.landmark
+            lm = np.fromiter(
+                (c for p in points for c in (p.x, p.y, p.z)),
+                dtype=np.float32,
+                count=3 * len(points),
+            ).reshape(-1, 3)
             out.append({
                 "landmarks": lm,
                 "handedness": handedness.classification[0].label,
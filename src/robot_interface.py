@@ -6,6 +6,12 @@ class RobotInterface:
         """Send a plain-text command to the robot. Override in implementations."""
         raise NotImplementedError()
 
+    def flush(self) -> None:
+        """Deliver commands buffered by send_command (no-op unless buffered)."""
+
+    def close(self) -> None:
+        """Release the robot connection (no-op unless one is held)."""
+
 
 class MockRobot(RobotInterface):
     def __init__(self):
@@ -23,13 +29,31 @@ class SerialRobot(RobotInterface):
         except Exception:
             raise RuntimeError("pyserial not installed or unavailable")
         self.ser = serial.Serial(port, baudrate=baud, timeout=timeout)
+        # Commands are queued here and written with one ser.write per flush()
+        self._buf = bytearray()
+
+    # Write right away once this much is queued, even before flush()
+    FLUSH_THRESHOLD = 256
 
     def send_command(self, cmd: str) -> None:
         if not self.ser or not self.ser.is_open:
             raise RuntimeError("serial port not open")
         # send with newline as delimiter
-        raw = (cmd + "\n").encode("utf-8")
-        self.ser.write(raw)
+        self._buf += (cmd + "\n").encode("utf-8")
+        if len(self._buf) >= self.FLUSH_THRESHOLD:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all queued commands in a single ser.write call."""
+        if self._buf:
+            self.ser.write(bytes(self._buf))
+            self._buf.clear()
+
+    def close(self) -> None:
+        """Write any queued commands, then close the port."""
+        if self.ser.is_open:
+            self.flush()
+            self.ser.close()
 
 
 class PiGPIORobot(RobotInterface):
@@ -44,6 +68,7 @@ class PiGPIORobot(RobotInterface):
     """
 
     def __init__(self):
+        self._parse_cache = {}  # (kind, pin) -> (handler, target, convert)
         # lazy import to avoid import errors on non-Pi systems
         try:
             from gpiozero import Servo, DigitalOutputDevice
@@ -62,6 +87,11 @@ class PiGPIORobot(RobotInterface):
             except Exception:
                 raise RuntimeError("No GPIO backend available (gpiozero or RPi.GPIO required on Raspberry Pi)")
 
+    # Resolved (kind, pin) pairs are cached by send_command; gestures drive
+    # a handful of pins, so the cache rarely fills
+    _PARSE_CACHE_SIZE = 64
+    _ON_STATES = ('on', '1', 'true')
+
     def _get_device(self, pin: int):
         if self._backend == 'gpiozero':
             if pin not in self._devices:
@@ -70,64 +100,83 @@ class PiGPIORobot(RobotInterface):
             return self._devices[pin]
         return None
 
+    def _parse(self, kind: str, pin: str):
+        """Resolve a command's `kind` and `pin` into (handler, target, convert).
+
+        `target` is the gpiozero device (created here, once) or the pin
+        number for RPi.GPIO; `convert` turns the command's value field into
+        the argument for `handler(target, value)`. Returns None if unknown.
+        """
+        if kind == 'relay' or kind == 'gpio':
+            pin = int(pin)
+            if self._backend == 'gpiozero':
+                return self._digital_gpiozero, self._get_device(pin), self._is_on
+            return self._digital_rpi, pin, self._is_on
+        if kind == 'servo':
+            pin = int(pin)
+            if self._backend == 'gpiozero':
+                if pin not in self._devices:
+                    self._devices[pin] = self._Servo(pin)
+                return self._servo_gpiozero, self._devices[pin], self._servo_value
+            return self._servo_rpi, pin, float
+        return None
+
+    @classmethod
+    def _is_on(cls, value: str) -> bool:
+        return value.lower() in cls._ON_STATES
+
+    @staticmethod
+    def _servo_value(value: str) -> float:
+        # Servo expects value in -1..1
+        return max(-1.0, min(1.0, float(value)))
+
+    @staticmethod
+    def _digital_gpiozero(dev, on: bool) -> None:
+        if on:
+            dev.on()
+        else:
+            dev.off()
+
+    @staticmethod
+    def _servo_gpiozero(dev, val: float) -> None:
+        dev.value = val
+
+    def _digital_rpi(self, pin: int, on: bool) -> None:
+        self._GPIO.setup(pin, self._GPIO.OUT)
+        self._GPIO.output(pin, self._GPIO.HIGH if on else self._GPIO.LOW)
+
+    def _servo_rpi(self, pin: int, val: float) -> None:
+        # RPi.GPIO PWM example: convert -1..1 to pwm duty cycle
+        duty = (val + 1.0) / 2.0 * 100.0
+        if pin not in self._pwm:
+            self._GPIO.setup(pin, self._GPIO.OUT)
+            p = self._GPIO.PWM(pin, 50)
+            p.start(duty)
+            self._pwm[pin] = p
+        else:
+            self._pwm[pin].ChangeDutyCycle(duty)
+
     def send_command(self, cmd: str) -> None:
-        # parse simple commands
         try:
             parts = cmd.split(":")
-            if parts[0] == 'relay' and len(parts) >= 3:
-                pin = int(parts[1])
-                state = parts[2].lower()
-                if self._backend == 'gpiozero':
-                    dev = self._get_device(pin)
-                    if state in ('on', '1', 'true'):
-                        dev.on()
-                    else:
-                        dev.off()
-                else:
-                    # RPi.GPIO fallback
-                    if not hasattr(self._GPIO, 'pins_setup'):
-                        self._GPIO.setup(pin, self._GPIO.OUT)
-                    if state in ('on', '1', 'true'):
-                        self._GPIO.output(pin, self._GPIO.HIGH)
-                    else:
-                        self._GPIO.output(pin, self._GPIO.LOW)
-                return
-
-            if parts[0] == 'servo' and len(parts) >= 3:
-                pin = int(parts[1])
-                val = float(parts[2])
-                if self._backend == 'gpiozero':
-                    # Servo expects value in -1..1
-                    if pin not in self._devices:
-                        self._devices[pin] = self._Servo(pin)
-                    self._devices[pin].value = max(-1.0, min(1.0, val))
-                else:
-                    # RPi.GPIO PWM example: convert -1..1 to pwm duty cycle
-                    duty = (val + 1.0) / 2.0 * 100.0
-                    if pin not in self._pwm:
-                        self._GPIO.setup(pin, self._GPIO.OUT)
-                        p = self._GPIO.PWM(pin, 50)
-                        p.start(duty)
-                        self._pwm[pin] = p
-                    else:
-                        self._pwm[pin].ChangeDutyCycle(duty)
+            if len(parts) < 3:
+                print(f"[PiGPIORobot] Unknown command: {cmd}")
                 return
-
-            if parts[0] == 'gpio' and len(parts) >= 3:
-                pin = int(parts[1])
-                state = parts[2].lower()
-                if self._backend == 'gpiozero':
-                    dev = self._get_device(pin)
-                    if state in ('on', '1', 'true'):
-                        dev.on()
-                    else:
-                        dev.off()
-                else:
-                    self._GPIO.setup(pin, self._GPIO.OUT)
-                    self._GPIO.output(pin, self._GPIO.HIGH if state in ('on', '1', 'true') else self._GPIO.LOW)
-                return
-
-            # unknown command: print/log
-            print(f"[PiGPIORobot] Unknown command: {cmd}")
+            # Each (kind, pin) is resolved (and its device created) only
+            # once; the value changes per command, so it is converted here
+            key = (parts[0], parts[1])
+            parsed = self._parse_cache.get(key)
+            if parsed is None:
+                parsed = self._parse(*key)
+                if parsed is None:
+                    # unknown command: print/log
+                    print(f"[PiGPIORobot] Unknown command: {cmd}")
+                    return
+                if len(self._parse_cache) >= self._PARSE_CACHE_SIZE:
+                    # drop the oldest entry (dicts keep insertion order)
+                    del self._parse_cache[next(iter(self._parse_cache))]
+                self._parse_cache[key] = parsed
+            handler, target, convert = parsed
+            handler(target, convert(parts[2]))
         except Exception as e:
             print(f"[PiGPIORobot] Error handling command '{cmd}': {e}")
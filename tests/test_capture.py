@@ -0,0 +1,87 @@
+import threading
+import time
+
+import numpy as np
+
+from src.capture import CaptureThread
+
+
+def _counting_reader(limit=None):
+    count = [0]
+
+    def read(out):
+        if limit is not None and count[0] >= limit:
+            return False, None
+        count[0] += 1
+        if out is None:
+            out = np.empty((2, 2), dtype=np.int64)
+        out.fill(count[0])
+        return True, out
+
+    return read, count
+
+
+def test_read_returns_newest_frame():
+    read, _ = _counting_reader()
+    capture = CaptureThread(read).start()
+    try:
+        ok, frame = capture.read()
+        assert ok
+        first = frame[0, 0]
+        ok, frame = capture.read()
+        assert ok
+        assert frame[0, 0] > first
+    finally:
+        capture.stop()
+
+
+def test_held_frame_is_not_overwritten():
+    read, count = _counting_reader()
+    capture = CaptureThread(read).start()
+    try:
+        ok, frame = capture.read()
+        value = frame[0, 0]
+        # let the worker cycle through the other slots many times
+        deadline = time.monotonic() + 5.0
+        while count[0] < value + 50:
+            assert time.monotonic() < deadline, "capture worker stalled"
+            time.sleep(0.001)
+        assert (frame == value).all()
+    finally:
+        capture.stop()
+
+
+def test_camera_failure_is_reported():
+    read, _ = _counting_reader(limit=0)
+    capture = CaptureThread(read).start()
+    try:
+        assert capture.read() == (False, None)
+    finally:
+        capture.stop()
+
+
+def test_camera_exception_is_reported():
+    def raising_read(out):
+        raise RuntimeError("camera unplugged")
+
+    capture = CaptureThread(raising_read).start()
+    try:
+        start = time.monotonic()
+        assert capture.read(timeout=30) == (False, None)
+        # reported by the worker, not by waiting out the read timeout
+        assert time.monotonic() - start < 5
+    finally:
+        assert capture.stop() is True
+
+
+def test_stop_reports_a_blocked_worker():
+    release = threading.Event()
+
+    def blocking_read(out):
+        release.wait()
+        return False, None
+
+    capture = CaptureThread(blocking_read).start()
+    assert capture.stop(timeout=0.05) is False
+    release.set()
+    assert capture.stop() is True
@@ -0,0 +1,43 @@
+import cv2
+import numpy as np
+
+from src.drawing import StaticOverlay, cached_put_text
+
+
+def test_static_overlay_matches_put_text():
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, (120, 200, 3), dtype=np.uint8)
+    expected = frame.copy()
+    cv2.putText(expected, "Press 'q'", (10, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+
+    overlay = StaticOverlay(frame.shape)
+    overlay.put_text("Press 'q'", (10, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+    overlay.apply(frame)
+    # putText may anti-alias; blended edge pixels can differ by rounding
+    assert np.abs(frame.astype(int) - expected).max() <= 1
+
+
+def test_cached_put_text_matches_put_text():
+    rng = np.random.default_rng(1)
+    frame = rng.integers(0, 255, (120, 200, 3), dtype=np.uint8)
+    expected = frame.copy()
+    # second label runs off the top-right corner of the frame
+    labels = [("Fingers: 3", (10, 40), 1.0, (0, 255, 255), 3),
+              ("Gesture: open", (150, 8), 0.8, (255, 128, 0), 2)]
+    for text, org, scale, color, thickness in labels:
+        cv2.putText(expected, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+    for _ in range(2):  # render, then hit the cache
+        out = frame.copy()
+        for text, org, scale, color, thickness in labels:
+            cached_put_text(out, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+        assert np.abs(out.astype(int) - expected).max() <= 1
+
+
+def test_landmarks_to_pixels():
+    from src.drawing import fingertip_points, landmarks_to_pixels
+    lm = [(0.5, 0.25, 0.0)] * 21
+    lm[8] = (1.0, 1.0, 0.0)
+    pts = landmarks_to_pixels(lm, (480, 640, 3))
+    assert pts.dtype == np.int32 and pts.shape == (21, 2)
+    assert pts[0].tolist() == [320, 120]
+    assert fingertip_points(pts)[1] == [640, 480]
@@ -62,3 +62,126 @@ def test_count_two_fingers():
     lm[20] = (0.5, 0.7, 0.0)
     from src.gestures import count_extended_fingers
     assert count_extended_fingers(lm, handedness=None) >= 2
+
+
+def test_count_accepts_ndarray_landmarks():
+    import numpy as np
+    from src.gestures import count_extended_fingers
+    lm = [(0.5, 0.5, 0.0)] * 21
+    lm[5] = (0.5, 0.6, 0.0)
+    lm[6] = (0.5, 0.5, 0.0)
+    lm[8] = (0.5, 0.2, 0.0)
+    lm[10] = (0.5, 0.4, 0.0)
+    lm[12] = (0.5, 0.6, 0.0)
+    arr = np.asarray(lm, dtype=np.float32)
+    assert count_extended_fingers(arr) == count_extended_fingers(lm)
+
+
+def test_compiled_kernels_match_numpy_path():
+    # without numba the kernels run as plain Python, which still checks the logic
+    import random
+    import numpy as np
+    from src.gestures import (_count_ext_np, _count_ext_nb, _classify_nb,
+                              _tip_distances_np, _tip_distances_nb)
+    rng = random.Random(0)
+    for _ in range(200):
+        arr = np.array([(rng.random(), rng.random(), rng.uniform(-0.1, 0.1)) for _ in range(21)],
+                       dtype=np.float32)
+        n = _count_ext_np(arr)
+        assert _count_ext_nb(arr) == n
+        pinch, count = _classify_nb(arr, 0.05)
+        assert count == (0 if pinch else n)
+        assert np.allclose(_tip_distances_nb(arr), _tip_distances_np(arr))
+
+
+def _shifted_hand(dx=0.0, dy=0.0):
+    return [(0.5 + dx, 0.5 + dy, 0.0)] * 21
+
+
+def test_movement_direction_ignores_still_hand():
+    from src.gestures import detect_movement_direction, reset_movement_tracking
+    reset_movement_tracking()
+    assert detect_movement_direction(_shifted_hand()) is None
+    assert detect_movement_direction(_shifted_hand(0.002)) is None
+    assert detect_movement_direction(_shifted_hand(0.1)) == "right"
+    assert detect_movement_direction(_shifted_hand(0.1, -0.1)) == "up"
+    reset_movement_tracking()
+
+
+def test_hand_center_same_for_list_and_ndarray():
+    import numpy as np
+    from src.gestures import get_hand_center
+    lm = [(0.01 * i, 0.5 - 0.02 * i, 0.0) for i in range(21)]
+    expected = get_hand_center(lm)
+    assert np.allclose(get_hand_center(np.asarray(lm, dtype=np.float32)), expected)
+    assert np.allclose(expected, (0.1, 0.3))
+
+
+def test_movement_tracking_survives_brief_dropout():
+    from src import gestures
+    gestures.reset_movement_tracking()
+    gestures.detect_movement_direction(_shifted_hand())
+    for _ in range(gestures.NO_HAND_RESET_FRAMES - 1):
+        gestures.note_no_hand()
+    assert gestures.detect_movement_direction(_shifted_hand(0.1)) == "right"
+    for _ in range(gestures.NO_HAND_RESET_FRAMES):
+        gestures.note_no_hand()
+    # history was dropped: the next frame only starts tracking again
+    assert gestures.detect_movement_direction(_shifted_hand(0.2)) is None
+    gestures.reset_movement_tracking()
+
+
+def test_joint_cos_accepts_batches():
+    import numpy as np
+    from src.gestures import _joint_cos
+    rng = np.random.default_rng(3)
+    batch = rng.random((4, 21, 3)).astype(np.float32)
+    cos = _joint_cos(batch)
+    assert cos.shape == (4, 5)
+    assert np.allclose(cos[2], _joint_cos(batch[2]))
+
+
+def test_batch_matches_single_hand_detection():
+    import numpy as np
+    from src.gestures import (_classify_batch_np, count_extended_fingers,
+                              detect_gesture_with_handedness, detect_gestures_batch)
+    rng = np.random.default_rng(4)
+    hands = rng.random((50, 21, 3)).astype(np.float32)
+    hands[0, 8] = hands[0, 4]  # pinching
+    expected = [detect_gesture_with_handedness(h) for h in hands]
+    assert detect_gestures_batch(hands) == expected
+    assert detect_gestures_batch(list(hands[:2])) == expected[:2]
+    assert detect_gestures_batch([]) == []
+    # the NumPy kernel is only used without numba; check it either way
+    pinch, counts = _classify_batch_np(hands, 0.05)
+    assert pinch.tolist() == [g == "pinch" for g in expected]
+    assert counts.tolist() == [0 if p else count_extended_fingers(h) for p, h in zip(pinch, hands)]
+
+
+def test_batch_rejects_misshapen_input():
+    import numpy as np
+    import pytest
+    from src.gestures import detect_gestures_batch
+    assert len(detect_gestures_batch(np.zeros((21, 3)))) == 1
+    for shape in ((21, 20, 3), (42, 3), (2, 21, 2), (21 * 3,)):
+        with pytest.raises(ValueError):
+            detect_gestures_batch(np.zeros(shape))
+
+
+def test_movement_trackers_are_independent():
+    from src.gestures import MovementTracker, detect_gesture_with_direction
+    left, right = MovementTracker(), MovementTracker()
+    left.direction(_shifted_hand())
+    right.direction(_shifted_hand(0.5))
+    assert left.direction(_shifted_hand(-0.1)) == "left"
+    assert detect_gesture_with_direction(_shifted_hand(0.6), tracker=right)['direction'] == "right"
+
+
+
+def test_warm_up_compiles_the_kernels():
+    from src import gestures
+    gestures.warm_up()
+    if gestures.njit is not None:
+        for kernel in (gestures._classify_nb, gestures._count_ext_nb,
+                       gestures._tip_distances_nb, gestures._classify_batch_nb):
+            assert kernel.signatures
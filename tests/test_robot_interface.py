@@ -0,0 +1,124 @@
+import sys
+import types
+
+from src.robot_interface import PiGPIORobot, SerialRobot
+
+
+class _FakeDevice:
+    def __init__(self, pin):
+        self.pin = pin
+        self.value = None
+        self.is_on = False
+
+    def on(self):
+        self.is_on = True
+
+    def off(self):
+        self.is_on = False
+
+
+class _FakeSerial:
+    def __init__(self, port, baudrate=None, timeout=None):
+        self.is_open = True
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append(data)
+
+    def close(self):
+        self.is_open = False
+
+
+def _serial_robot(monkeypatch):
+    fake = types.ModuleType("serial")
+    fake.Serial = _FakeSerial
+    monkeypatch.setitem(sys.modules, "serial", fake)
+    return SerialRobot()
+
+
+def _gpiozero_robot(monkeypatch):
+    fake = types.ModuleType("gpiozero")
+    fake.Servo = type("Servo", (_FakeDevice,), {})
+    fake.DigitalOutputDevice = type("DigitalOutputDevice", (_FakeDevice,), {})
+    monkeypatch.setitem(sys.modules, "gpiozero", fake)
+    robot = PiGPIORobot()
+    calls = []
+    parse = robot._parse
+
+    def counting_parse(kind, pin):
+        calls.append((kind, pin))
+        return parse(kind, pin)
+
+    monkeypatch.setattr(robot, "_parse", counting_parse)
+    return robot, calls
+
+
+def test_parse_cache_hit_reuses_device_per_pin(monkeypatch):
+    robot, calls = _gpiozero_robot(monkeypatch)
+    robot.send_command("servo:18:0.5")
+    servo = robot._devices[18]
+    robot.send_command("servo:18:-0.25")
+    robot.send_command("servo:18:3")
+    robot.send_command("relay:17:on")
+    robot.send_command("relay:17:off")
+
+    assert calls == [("servo", "18"), ("relay", "17")]
+    assert robot._devices[18] is servo
+    assert servo.value == 1.0  # clamped to the Servo range
+    assert robot._devices[17].is_on is False
+
+
+def test_parse_cache_evicts_oldest(monkeypatch):
+    robot, calls = _gpiozero_robot(monkeypatch)
+    monkeypatch.setattr(robot, "_PARSE_CACHE_SIZE", 2)
+    for pin in (1, 2, 3):
+        robot.send_command(f"gpio:{pin}:on")
+    assert list(robot._parse_cache) == [("gpio", "2"), ("gpio", "3")]
+
+    robot.send_command("gpio:1:off")
+    assert calls[-1] == ("gpio", "1")
+    assert list(robot._parse_cache) == [("gpio", "3"), ("gpio", "1")]
+
+
+def test_invalid_command_is_reported_not_cached(monkeypatch, capsys):
+    robot, _ = _gpiozero_robot(monkeypatch)
+    robot.send_command("laser:4:on")
+    robot.send_command("relay:4")
+    robot.send_command("servo:x:0.5")
+
+    out = capsys.readouterr().out
+    assert out.count("Unknown command") == 2
+    assert "Error handling command 'servo:x:0.5'" in out
+    assert robot._parse_cache == {}
+
+
+def test_serial_flush_writes_once(monkeypatch):
+    robot = _serial_robot(monkeypatch)
+    robot.send_command("relay:1:on")
+    robot.send_command("servo:2:0.5")
+    assert robot.ser.writes == []
+
+    robot.flush()
+    robot.flush()
+    assert robot.ser.writes == [b"relay:1:on\nservo:2:0.5\n"]
+
+
+def test_serial_flushes_at_threshold(monkeypatch):
+    robot = _serial_robot(monkeypatch)
+    cmd = "x" * 99  # 100 bytes with the newline
+    for _ in range(SerialRobot.FLUSH_THRESHOLD // 100):
+        robot.send_command(cmd)
+    assert robot.ser.writes == []
+
+    robot.send_command(cmd)
+    assert len(robot.ser.writes) == 1
+    assert len(robot.ser.writes[0]) >= SerialRobot.FLUSH_THRESHOLD
+
+
+def test_serial_close_flushes(monkeypatch):
+    robot = _serial_robot(monkeypatch)
+    robot.send_command("gpio:3:off")
+    robot.close()
+    assert robot.ser.writes == [b"gpio:3:off\n"]
+    assert not robot.ser.is_open
+    robot.close()  # closing twice is harmless